@@ -10,7 +10,9 @@ This script provides enhanced PDF conversion capabilities, including:
 
 Requirements:
     - pdfminer.six
+    - pypdfium2 (optional, fastest text extraction)
     - pymupdf (fitz)
+    - pymupdf4llm (optional, better Markdown output)
     - markdown
     - argparse
     - tqdm
@@ -22,41 +24,160 @@ Usage:
 import os
 import sys
 import argparse
-import glob
+import fnmatch
+import gc
+import hashlib
+import html
 import re
+import signal
+import string
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from io import StringIO
 from tqdm import tqdm
 
 # Import pdfminer.six components
-from pdfminer.high_level import extract_text_to_fp, extract_text
 from pdfminer.layout import LAParams
+from pdfminer.converter import TextConverter
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
 
 # Try to import optional libraries
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 try:
     import fitz  # PyMuPDF
     PYMUPDF_AVAILABLE = True
+    # Keep MuPDF's own error messages from interleaving with the progress bar
+    fitz.TOOLS.mupdf_display_errors(False)
 except ImportError:
     PYMUPDF_AVAILABLE = False
 
+try:
+    import pymupdf4llm
+    PYMUPDF4LLM_AVAILABLE = True
+except ImportError:
+    PYMUPDF4LLM_AVAILABLE = False
+
 try:
     import markdown
     MARKDOWN_AVAILABLE = True
 except ImportError:
     MARKDOWN_AVAILABLE = False
 
+# Layout parameters for the pdfminer engine. detect_vertical handles rotated
+# text, which otherwise produces pathologically slow layout analysis.
+PDFMINER_LAPARAMS = LAParams(detect_vertical=True, char_margin=2.0, line_margin=0.5, word_margin=0.1)
+
+# Extracted text is cached here so producing several formats from the same
+# PDF only parses it once
+TEXT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pdfconv")
+
+# Cache entries unused for this long are deleted, then the least recently used
+# ones while the cache is over the size limit
+TEXT_CACHE_MAX_AGE_DAYS = 30
+TEXT_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# HTML document structure for convert_to_html. Images are streamed between
+# the header and the footer.
+HTML_HEADER_TEMPLATE = string.Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>$title</title>
+<style>
+    body { font-family: Arial, sans-serif; line-height: 1.5; max-width: 900px; margin: 0 auto; padding: 20px; }
+    h1, h2, h3, h4, h5, h6 { color: #333; margin-top: 24px; }
+    table { border-collapse: collapse; width: 100%; margin: 16px 0; }
+    table, th, td { border: 1px solid #ddd; }
+    th, td { padding: 8px; text-align: left; }
+    th { background-color: #f2f2f2; }
+    .page { border-bottom: 1px dashed #ccc; margin-bottom: 20px; padding-bottom: 20px; }
+    img { max-width: 100%; height: auto; border: 1px solid #ddd; padding: 5px; }
+    pre { white-space: pre-wrap; }
+    .pdf-images { margin-top: 30px; border-top: 2px solid #ccc; padding-top: 20px; }
+    .image-container { margin-bottom: 20px; text-align: center; }
+    .image-container p { font-style: italic; margin-top: 8px; color: #666; }
+</style>
+</head>
+<body>
+<h1>$title</h1>
+<div class="content">
+<pre>
+$body
+</pre>""")
+
+HTML_IMAGES_START = "\n<div class='pdf-images'>\n<h2>Images from Document</h2>\n"
+HTML_IMAGES_END = "</div>\n"
+
+HTML_FOOTER = """
+</div>
+
+</body>
+</html>
+"""
+
+# Threads used to write extracted images while the next one is decoded
+IMAGE_WRITE_WORKERS = 4
+
+# Documents with more pages than this are split across page_workers
+PAGE_SPLIT_THRESHOLD = 50
+
+class PageTimeoutError(BaseException):
+    """
+    Raised when pdfminer takes too long to process a single page.
+    
+    Derived from BaseException so that pdfminer's own ``except Exception``
+    handlers cannot swallow it mid-page.
+    """
+
+def _raise_page_timeout(signum, frame):
+    raise PageTimeoutError()
+
+def _write_bytes(path, data):
+    """Write bytes to a file, replacing any existing content."""
+    with open(path, "wb") as f:
+        f.write(data)
+
 class PDFConverter:
     """Advanced PDF conversion with multiple output formats and options."""
     
-    def __init__(self, include_images=False, image_dir=None):
+    def __init__(self, include_images=False, image_dir=None, engine=None, page_timeout=None,
+                 use_cache=True, page_workers=1):
         """
         Initialize the converter with options.
         
         Args:
             include_images (bool): Whether to extract images from PDFs
             image_dir (str): Directory to save extracted images
+            engine (str): Text extraction engine ('pypdfium2', 'pymupdf' or
+                'pdfminer'). Defaults to the first one installed, in that order.
+            page_timeout (float): Seconds the pdfminer engine may spend on a
+                single page before skipping it (None for no limit)
+            use_cache (bool): Whether to cache extracted text on disk
+            page_workers (int): Worker processes used to extract the pages of
+                a single large PDF with the pypdfium2 and pymupdf engines
         """
         self.include_images = include_images
         self.image_dir = image_dir
+        self.page_timeout = page_timeout
+        self.use_cache = use_cache
+        self.page_workers = page_workers or 1
+        self._pages_skipped = 0
+        
+        if engine is None:
+            if PDFIUM_AVAILABLE:
+                engine = 'pypdfium2'
+            elif PYMUPDF_AVAILABLE:
+                engine = 'pymupdf'
+            else:
+                engine = 'pdfminer'
+        self.engine = engine
         
         # Create image directory if needed
         if self.include_images and self.image_dir and not os.path.exists(self.image_dir):
@@ -75,51 +196,19 @@ class PDFConverter:
         """
         try:
             # First extract text as plain text
-            text = extract_text(pdf_path)
-            
-            # Create basic HTML structure
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<title>{os.path.basename(pdf_path)}</title>
-<style>
-    body {{ font-family: Arial, sans-serif; line-height: 1.5; max-width: 900px; margin: 0 auto; padding: 20px; }}
-    h1, h2, h3, h4, h5, h6 {{ color: #333; margin-top: 24px; }}
-    table {{ border-collapse: collapse; width: 100%; margin: 16px 0; }}
-    table, th, td {{ border: 1px solid #ddd; }}
-    th, td {{ padding: 8px; text-align: left; }}
-    th {{ background-color: #f2f2f2; }}
-    .page {{ border-bottom: 1px dashed #ccc; margin-bottom: 20px; padding-bottom: 20px; }}
-    img {{ max-width: 100%; height: auto; border: 1px solid #ddd; padding: 5px; }}
-    pre {{ white-space: pre-wrap; }}
-    .pdf-images {{ margin-top: 30px; border-top: 2px solid #ccc; padding-top: 20px; }}
-    .image-container {{ margin-bottom: 20px; text-align: center; }}
-    .image-container p {{ font-style: italic; margin-top: 8px; color: #666; }}
-</style>
-</head>
-<body>
-<h1>{os.path.basename(pdf_path)}</h1>
-<div class="content">
-<pre>
-{text}
-</pre>
-</div>
-"""
-            
-            # Add images if enabled and PyMuPDF is available
-            if self.include_images and PYMUPDF_AVAILABLE:
-                html_content = self._add_images_to_html(pdf_path, html_content, html_path)
+            text = self._get_text(pdf_path)
             
-            # Close the HTML
-            html_content += """
-</body>
-</html>
-"""
-            
-            # Write the final HTML
             with open(html_path, 'w', encoding='utf-8') as html_file:
-                html_file.write(html_content)
+                # Write the basic HTML structure up to the end of the text
+                title = html.escape(os.path.basename(pdf_path))
+                html_file.write(HTML_HEADER_TEMPLATE.substitute(title=title, body=html.escape(text)))
+                
+                # Stream images after the text if enabled and PyMuPDF is available
+                if self.include_images and PYMUPDF_AVAILABLE:
+                    self._stream_images(pdf_path, html_file, html_path)
+                
+                # Close the HTML
+                html_file.write(HTML_FOOTER)
                 
             return True
             
@@ -139,7 +228,7 @@ class PDFConverter:
             bool: True if successful, False otherwise
         """
         try:
-            text = extract_text(pdf_path)
+            text = self._get_text(pdf_path)
             
             with open(text_path, 'w', encoding='utf-8') as text_file:
                 text_file.write(text)
@@ -166,32 +255,16 @@ class PDFConverter:
             return False
             
         try:
-            # First extract as plain text
-            text = extract_text(pdf_path)
-            
-            # Simple heuristics to improve markdown structure
-            # 1. Try to identify headers by length and newlines
-            lines = text.split('\n')
-            md_lines = []
-            
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:
-                    md_lines.append('')
-                    continue
-                    
-                # Potential header detection (short line followed by blank line)
-                if len(line) < 80 and i < len(lines) - 1 and not lines[i+1].strip():
-                    if len(line) < 30:  # Likely a main header
-                        md_lines.append(f'## {line}')
-                    else:  # Likely a subheader
-                        md_lines.append(f'### {line}')
-                else:
-                    # Regular text
-                    md_lines.append(line)
-            
-            # Join lines back together
-            markdown_text = '\n'.join(md_lines)
+            if self.engine in ('pymupdf', 'pypdfium2') and PYMUPDF4LLM_AVAILABLE:
+                # pymupdf4llm already emits headers and tables
+                markdown_text = pymupdf4llm.to_markdown(pdf_path)
+            else:
+                # Header detection needs the blank lines between paragraphs,
+                # which PDFium doesn't report, so use a layout-aware engine
+                engine = self.engine
+                if engine == 'pypdfium2':
+                    engine = 'pymupdf' if PYMUPDF_AVAILABLE else 'pdfminer'
+                markdown_text = self._text_to_markdown(self._get_text(pdf_path, engine))
             
             # Write the markdown file
             with open(md_path, 'w', encoding='utf-8') as md_file:
@@ -203,18 +276,221 @@ class PDFConverter:
             print(f"Error converting {pdf_path} to markdown: {str(e)}")
             return False
     
-    def _add_images_to_html(self, pdf_path, html_content, html_path):
+    def _get_text(self, pdf_path, engine=None):
+        """
+        Get the plain text of a PDF, using the on-disk text cache if possible.
+        
+        Cache entries are keyed by the PDF's path, modification time and size
+        and by the engine, so a changed file is always re-extracted.
+        
+        Args:
+            pdf_path (str): Path to input PDF
+            engine (str): Engine to extract with instead of the converter's own
+            
+        Returns:
+            str: Extracted text
+        """
+        engine = engine or self.engine
+        if not self.use_cache:
+            return self._extract_text_fast(pdf_path, engine)
+        
+        stat = os.stat(pdf_path)
+        key = f"{os.path.abspath(pdf_path)}|{stat.st_mtime}|{stat.st_size}|{engine}"
+        cache_path = os.path.join(TEXT_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".txt")
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as cache_file:
+                text = cache_file.read()
+        except OSError:
+            pass
+        else:
+            # The modification time records when an entry was last used. Failing
+            # to touch an entry (e.g. one owned by another user) is harmless.
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return text
+        
+        self._pages_skipped = 0
+        text = self._extract_text_fast(pdf_path, engine)
+        
+        # Don't cache partial text from pages that timed out
+        if not self._pages_skipped:
+            try:
+                os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+                # Write to a temporary file first as other workers may read the cache
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                    cache_file.write(text)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"Warning: Could not cache text for {pdf_path}: {str(e)}")
+        
+        return text
+    
+    def _extract_text_fast(self, pdf_path, engine=None):
+        """
+        Extract plain text from a PDF using the selected engine.
+        
+        pypdfium2 and PyMuPDF are several times faster than pdfminer on large
+        documents, so pdfminer is only used when neither is available or it
+        is requested explicitly.
+        
+        Args:
+            pdf_path (str): Path to input PDF
+            engine (str): Engine to extract with instead of the converter's own
+            
+        Returns:
+            str: Extracted text
+        """
+        engine = engine or self.engine
+        if engine == 'pypdfium2':
+            pdf = pdfium.PdfDocument(pdf_path)
+            try:
+                page_count = len(pdf)
+                if self.page_workers <= 1 or page_count <= PAGE_SPLIT_THRESHOLD:
+                    return "\n".join(_pdfium_page_text(pdf[page_num]) for page_num in range(page_count))
+            finally:
+                pdf.close()
+            return self._extract_split(engine, pdf_path, page_count)
+        
+        if engine == 'pymupdf':
+            doc = fitz.open(pdf_path)
+            try:
+                page_count = doc.page_count
+                if self.page_workers <= 1 or page_count <= PAGE_SPLIT_THRESHOLD:
+                    return "\n".join(_pymupdf_page_text(page) for page in doc)
+            finally:
+                doc.close()
+                # Release MuPDF's cached objects so memory stays flat across a batch
+                fitz.TOOLS.store_shrink(100)
+            return self._extract_split(engine, pdf_path, page_count)
+        
+        return self._pdfminer_extract(pdf_path)
+    
+    def _extract_split(self, engine, pdf_path, page_count):
+        """
+        Extract a large document's page ranges in parallel worker processes.
+        
+        Neither PDFium nor MuPDF is thread-safe, so each range gets its own
+        process and its own copy of the document.
+        
+        Args:
+            engine (str): 'pypdfium2' or 'pymupdf'
+            pdf_path (str): Path to input PDF
+            page_count (int): Number of pages in the document
+            
+        Returns:
+            str: Extracted text
+        """
+        chunk_size = -(-page_count // self.page_workers)
+        page_ranges = [(engine, pdf_path, start, min(start + chunk_size, page_count))
+                       for start in range(0, page_count, chunk_size)]
+        with ProcessPoolExecutor(max_workers=len(page_ranges)) as executor:
+            return "\n".join(executor.map(_extract_page_range, page_ranges))
+    
+    def _pdfminer_extract(self, pdf_path):
+        """
+        Extract plain text from a PDF with pdfminer, one page at a time.
+        
+        Pages that take longer than page_timeout seconds are skipped with a
+        warning so that a single pathological page cannot stall a batch. The
+        timeout uses SIGALRM and is not applied on platforms without it
+        (Windows) or outside the main thread.
+        
+        Args:
+            pdf_path (str): Path to input PDF
+            
+        Returns:
+            str: Extracted text
+        """
+        use_timeout = (bool(self.page_timeout) and hasattr(signal, "SIGALRM")
+                       and threading.current_thread() is threading.main_thread())
+        
+        # One resource manager and device serve every page of the document.
+        # The manager is not shared between documents: its font cache is keyed
+        # by PDF object id, and those ids are only unique within one file.
+        output = StringIO()
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, output, laparams=PDFMINER_LAPARAMS)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        
+        if use_timeout:
+            previous_handler = signal.signal(signal.SIGALRM, _raise_page_timeout)
+        
+        try:
+            with open(pdf_path, 'rb') as pdf_file:
+                for page_num, page in enumerate(PDFPage.get_pages(pdf_file, caching=True), 1):
+                    # The timer is armed and disarmed inside the outer try, so an
+                    # alarm that fires at any point is caught as a skipped page
+                    try:
+                        try:
+                            if use_timeout:
+                                signal.setitimer(signal.ITIMER_REAL, self.page_timeout)
+                            interpreter.process_page(page)
+                        finally:
+                            if use_timeout:
+                                signal.setitimer(signal.ITIMER_REAL, 0)
+                    except PageTimeoutError:
+                        # An interrupted page can leave figures open on the device,
+                        # which would fail the next page's end_page check
+                        device._stack.clear()
+                        device.cur_item = None
+                        self._pages_skipped += 1
+                        print(f"Warning: Skipped page {page_num} of {pdf_path} "
+                              f"after {self.page_timeout} seconds")
+            
+            return output.getvalue()
+            
+        finally:
+            if use_timeout:
+                signal.signal(signal.SIGALRM, previous_handler)
+            device.close()
+    
+    def _text_to_markdown(self, text):
+        """
+        Apply simple heuristics to turn plain text into Markdown.
+        
+        Args:
+            text (str): Plain text extracted from a PDF
+            
+        Returns:
+            str: Markdown text
+        """
+        # Simple heuristics to improve markdown structure
+        # 1. Try to identify headers by length and newlines
+        # Each line is stripped once; header detection looks one line ahead
+        lines = [line.strip() for line in text.split('\n')]
+        next_blank = [not line for line in lines[1:]]
+        next_blank.append(False)
+        
+        # Potential header detection (short line followed by blank line):
+        # under 30 characters is likely a main header, under 80 a subheader
+        md_lines = [
+            line if not blank_after or not line or len(line) >= 80
+            else f'## {line}' if len(line) < 30
+            else f'### {line}'
+            for line, blank_after in zip(lines, next_blank)
+        ]
+        
+        # Join lines back together
+        return '\n'.join(md_lines)
+    
+    def _stream_images(self, pdf_path, html_file, html_path):
         """
-        Extract images from PDF and add them to HTML.
+        Extract images from PDF and write their tags directly to the HTML file.
         
         Args:
             pdf_path (str): Path to input PDF
-            html_content (str): HTML content to augment
+            html_file (file): Open HTML output file to write image tags to
             html_path (str): Path to output HTML (used for relative paths)
             
         Returns:
-            str: Updated HTML content with image tags
+            int: Number of images written
         """
+        image_count = 0
+        
         try:
             # Create a specific image directory for this HTML file
             base_name = os.path.splitext(os.path.basename(html_path))[0]
@@ -226,65 +502,261 @@ class PDFConverter:
             if not os.path.exists(file_image_dir):
                 os.makedirs(file_image_dir)
             
+            # Relative path from HTML to images - adjusted for root level extracted_images
+            image_src_prefix = f"../extracted_images/{base_name}/"
+            
+            # Image files are written on background threads so disk I/O
+            # overlaps with decoding the next image
+            io_pool = ThreadPoolExecutor(max_workers=IMAGE_WRITE_WORKERS)
+            write_futures = []
+            
             # Open the PDF document
             doc = fitz.open(pdf_path)
-            image_count = 0
-            all_images_html = "\n<div class='pdf-images'>\n<h2>Images from Document</h2>\n"
-            
-            # Iterate through pages to extract images
-            for page_num, page in enumerate(doc):
-                images = page.get_images(full=True)
-                
-                if images:  # Only create a page section if images exist
-                    all_images_html += f"<h3>Images from page {page_num+1}</h3>\n"
+            try:
+                # Images shared between pages (logos, headers) are saved once
+                saved_images = {}  # xref -> image filename
                 
-                for img_index, img in enumerate(images):
-                    xref = img[0]
-                    base_image = doc.extract_image(xref)
-                    image_bytes = base_image["image"]
+                # Iterate through pages to extract images
+                for page_num, page in enumerate(doc):
+                    images = page.get_images(full=False)
                     
-                    # Save the image
-                    image_filename = f"image_{page_num+1}_{img_index+1}.png"
-                    image_path = os.path.join(file_image_dir, image_filename)
+                    if not images:  # Only create a page section if images exist
+                        continue
                     
-                    with open(image_path, "wb") as img_file:
-                        img_file.write(image_bytes)
+                    # Open the images section on the first image found
+                    if image_count == 0:
+                        html_file.write(HTML_IMAGES_START)
+                    html_file.write(f"<h3>Images from page {page_num+1}</h3>\n")
                     
-                    # Calculate relative path from HTML to image - adjusted for root level extracted_images
-                    rel_image_path = os.path.join("extracted_images", base_name, image_filename).replace('\\', '/')
+                    for img_index, img in enumerate(images):
+                        xref = img[0]
+                        
+                        image_filename = saved_images.get(xref)
+                        if image_filename is None:
+                            base_image = doc.extract_image(xref)
+                            image_bytes = base_image["image"]
+                            
+                            # Save the image in its native format to avoid re-encoding
+                            image_filename = f"image_{page_num+1}_{img_index+1}.{base_image['ext']}"
+                            image_path = os.path.join(file_image_dir, image_filename)
+                            
+                            write_futures.append(io_pool.submit(_write_bytes, image_path, image_bytes))
+                            
+                            saved_images[xref] = image_filename
+                        
+                        # Write the image block straight to the output
+                        html_file.write(
+                            f'<div class="image-container">\n'
+                            f'  <img src="{image_src_prefix}{image_filename}" alt="Image {page_num+1}-{img_index+1}" />\n'
+                            f'  <p>Figure {page_num+1}.{img_index+1}</p>\n'
+                            f'</div>\n'
+                        )
+                        
+                        image_count += 1
                     
-                    # Create image tag and add to our collection
-                    all_images_html += f'<div class="image-container">\n'
-                    all_images_html += f'  <img src="../{rel_image_path}" alt="Image {page_num+1}-{img_index+1}" />\n'
-                    all_images_html += f'  <p>Figure {page_num+1}.{img_index+1}</p>\n'
-                    all_images_html += f'</div>\n'
-                    
-                    image_count += 1
+                    # Drop the page before loading the next one
+                    page = None
+            finally:
+                doc.close()
+                fitz.TOOLS.store_shrink(100)
+                io_pool.shutdown(wait=True)
             
-            all_images_html += "</div>\n"
+            # Surface any error from the image writes
+            for future in write_futures:
+                future.result()
             
-            # Insert all images after the content
             if image_count > 0:
                 print(f"Added {image_count} images to {html_path}")
-                
-                # We need to insert images before </body> tag
-                end_pre_pos = html_content.find("</pre>")
-                if end_pre_pos != -1:
-                    # Insert after the </pre> tag but before the closing </div>
-                    html_content = html_content[:end_pre_pos + 6] + all_images_html + html_content[end_pre_pos + 6:]
-                else:
-                    # If no </pre> tag found, insert before </body>
-                    body_end = html_content.find("</body>")
-                    if body_end != -1:
-                        html_content = html_content[:body_end] + all_images_html + html_content[body_end:]
-            
-            return html_content
             
         except Exception as e:
             print(f"Warning: Failed to extract images from {pdf_path}: {str(e)}")
-            return html_content
+        
+        # Close the images section if one was opened
+        if image_count > 0:
+            html_file.write(HTML_IMAGES_END)
+        
+        return image_count
+
+def _pymupdf_page_text(page):
+    """
+    Get the text of a PyMuPDF page with a blank line between text blocks.
+    
+    This matches pdfminer's layout, which the Markdown header detection
+    relies on to tell paragraphs apart.
+    
+    Args:
+        page (fitz.Page): Page to extract
+        
+    Returns:
+        str: Text of the page
+    """
+    return "\n".join(block[4] for block in page.get_text("blocks") if block[6] == 0)
+
+def _pdfium_page_text(page):
+    """
+    Get the text of a pypdfium2 page and release the page.
+    
+    Args:
+        page (pdfium.PdfPage): Page to extract
+        
+    Returns:
+        str: Text of the page
+    """
+    textpage = page.get_textpage()
+    try:
+        # PDFium separates lines with CRLF
+        return textpage.get_text_range().replace("\r\n", "\n")
+    finally:
+        textpage.close()
+        page.close()
+
+def _extract_page_range(args):
+    """
+    Extract the text of a range of pages in a worker process.
+    
+    Args:
+        args (tuple): (engine, PDF path, first page index, end page index)
+        
+    Returns:
+        str: Text of the pages, joined with newlines
+    """
+    engine, pdf_path, start, stop = args
+    if engine == 'pypdfium2':
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return "\n".join(_pdfium_page_text(pdf[page_num]) for page_num in range(start, stop))
+        finally:
+            pdf.close()
+    
+    doc = fitz.open(pdf_path)
+    try:
+        return "\n".join(_pymupdf_page_text(doc[page_num]) for page_num in range(start, stop))
+    finally:
+        doc.close()
+
+# Output file extension and PDFConverter method for each output format
+OUTPUT_FORMATS = {
+    'html': ('.html', 'convert_to_html'),
+    'text': ('.txt', 'convert_to_text'),
+    'markdown': ('.md', 'convert_to_markdown'),
+}
+
+def prune_text_cache(max_bytes=TEXT_CACHE_MAX_BYTES, max_age_days=TEXT_CACHE_MAX_AGE_DAYS):
+    """
+    Delete stale entries from the extracted text cache.
+    
+    Entries unused for more than max_age_days are removed first, then the
+    least recently used entries until the cache fits in max_bytes.
+    
+    Args:
+        max_bytes (int): Largest total size the cache may keep
+        max_age_days (float): Days an entry may go unused before it is removed
+    """
+    entries = []
+    try:
+        for entry in os.scandir(TEXT_CACHE_DIR):
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+    except OSError:
+        return
+    
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    cutoff = time.time() - max_age_days * 86400
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+# Suffix of the sidecar file that records the SHA1 of the PDF an output came from
+SHA1_SUFFIX = ".sha1"
 
-def batch_convert(converter, input_dir, output_dir, format_type, file_pattern="*.pdf"):
+def _file_sha1(path, block_size=1 << 20):
+    """Return the hex SHA1 digest of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Number of files a worker process converts between garbage collections
+GC_INTERVAL = 20
+_files_converted = 0
+
+def _convert_one(args):
+    """
+    Convert a single PDF in a worker process.
+    
+    Defined at module level so it can be pickled when workers are started
+    with the 'spawn' method (the default on Windows).
+    
+    Args:
+        args (tuple): (converter options, method name, PDF path, output path),
+            where converter options are PDFConverter keyword arguments and
+            method name is the conversion method from OUTPUT_FORMATS
+            
+    Returns:
+        tuple: (pdf_path, success, error message or None)
+    """
+    global _files_converted
+    
+    converter_options, method_name, pdf_path, output_path = args
+    convert = getattr(PDFConverter(**converter_options), method_name)
+    
+    try:
+        success = convert(pdf_path, output_path)
+        if success:
+            # Record the PDF contents so touched-but-unchanged PDFs can be skipped
+            with open(output_path + SHA1_SUFFIX, 'w', encoding='utf-8') as sha1_file:
+                sha1_file.write(_file_sha1(pdf_path))
+        return pdf_path, success, None
+    except Exception as e:
+        return pdf_path, False, str(e)
+    finally:
+        # Workers are long-lived, so periodically collect objects left by conversions
+        _files_converted += 1
+        if _files_converted % GC_INTERVAL == 0:
+            gc.collect()
+
+def _run_jobs(jobs, converter_options, method_name, workers, desc):
+    """
+    Run conversion jobs on a process pool, yielding results as they finish.
+    
+    Args:
+        jobs (list): (PDF path, output path) pairs
+        converter_options (dict): PDFConverter keyword arguments for the workers
+        method_name (str): Conversion method from OUTPUT_FORMATS
+        workers (int): Number of worker processes
+        desc (str): Progress bar description
+        
+    Yields:
+        tuple: (pdf_path, output_path, success, error message or None)
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_convert_one, (converter_options, method_name, pdf_path, output_path)): (pdf_path, output_path)
+            for pdf_path, output_path in jobs
+        }
+        
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc, ncols=100):
+            pdf_path, output_path = futures[future]
+            try:
+                _, success, error_message = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. crashed in a C extension)
+                success, error_message = False, str(e)
+            yield pdf_path, output_path, success, error_message
+
+def batch_convert(converter, input_dir, output_dir, format_type, file_pattern="*.pdf", workers=None,
+                  retry_engine=None, retry_without_images=False):
     """
     Convert all PDF files in a directory to the specified format.
     
@@ -294,6 +766,9 @@ def batch_convert(converter, input_dir, output_dir, format_type, file_pattern="*
         output_dir (str): Directory for output files
         format_type (str): Output format (html, text, markdown)
         file_pattern (str): File pattern to match PDF files
+        workers (int): Number of worker processes (default: number of CPUs)
+        retry_engine (str): Engine to retry failed files with (None for no retry)
+        retry_without_images (bool): Retry failed files without image extraction
         
     Returns:
         dict: Statistics about the conversion process
@@ -307,8 +782,17 @@ def batch_convert(converter, input_dir, output_dir, format_type, file_pattern="*
     search_pattern = os.path.join(input_dir, file_pattern)
     print(f"Using search pattern: {search_pattern}")
     
-    # Get all PDF files in the input directory
-    pdf_files = glob.glob(os.path.join(input_dir, file_pattern))
+    # Get all PDF files in the input directory in a single directory scan.
+    # DirEntry caches stat results, so the up-to-date check below needs no
+    # further syscalls for the PDFs.
+    pdf_entries = [
+        entry for entry in os.scandir(input_dir)
+        if not entry.name.startswith('.') and fnmatch.fnmatch(entry.name, file_pattern) and entry.is_file()
+    ]
+    pdf_files = [entry.path for entry in pdf_entries]
+    
+    # Modification times of existing outputs, keyed by file name
+    out_mod_times = {entry.name: entry.stat().st_mtime for entry in os.scandir(output_dir) if entry.is_file()}
     
     # Show found files
     print(f"Found {len(pdf_files)} PDF files:")
@@ -326,57 +810,91 @@ def batch_convert(converter, input_dir, output_dir, format_type, file_pattern="*
         "failures": []  # Track failed files and reasons
     }
     
-    # Process each PDF file with progress bar
-    for pdf_path in tqdm(pdf_files, desc=f"Converting PDFs to {format_type}", ncols=100):
-        # Get the base filename without extension
-        base_name = os.path.basename(pdf_path)
-        file_name = os.path.splitext(base_name)[0]
-        
-        # Create the output path with appropriate extension
-        if format_type == 'html':
-            output_path = os.path.join(output_dir, f"{file_name}.html")
-        elif format_type == 'text':
-            output_path = os.path.join(output_dir, f"{file_name}.txt")
-        elif format_type == 'markdown':
-            output_path = os.path.join(output_dir, f"{file_name}.md")
-        else:
-            print(f"Unsupported format type: {format_type}")
-            stats["failed"] += 1
-            stats["failures"].append((pdf_path, f"Unsupported format: {format_type}"))
-            continue
+    # The format is fixed for the whole batch, so resolve it once
+    output_ext, method_name = OUTPUT_FORMATS.get(format_type, (None, None))
+    if method_name is None:
+        print(f"Unsupported format type: {format_type}")
+        stats["failed"] = len(pdf_files)
+        stats["failures"] = [(pdf_path, f"Unsupported format: {format_type}") for pdf_path in pdf_files]
+        pdf_entries = []
+    
+    # Work out which files need converting before starting any workers
+    jobs = []
+    for entry in pdf_entries:
+        pdf_path = entry.path
+        output_name = os.path.splitext(entry.name)[0] + output_ext
+        output_path = os.path.join(output_dir, output_name)
         
-        # Check if file already exists
-        if os.path.exists(output_path):
-            # Check modification times
-            pdf_mod_time = os.path.getmtime(pdf_path)
-            out_mod_time = os.path.getmtime(output_path)
-            
-            # Skip if output is newer than PDF (already converted)
-            if out_mod_time > pdf_mod_time:
+        # Skip if output exists and is newer than PDF (already converted)
+        out_mod_time = out_mod_times.get(output_name)
+        if out_mod_time is not None:
+            if out_mod_time > entry.stat().st_mtime:
                 stats["skipped"] += 1
                 continue
-        
-        # Perform conversion based on format type
-        try:
-            if format_type == 'html':
-                success = converter.convert_to_html(pdf_path, output_path)
-            elif format_type == 'text':
-                success = converter.convert_to_text(pdf_path, output_path)
-            elif format_type == 'markdown':
-                success = converter.convert_to_markdown(pdf_path, output_path)
             
-            # Update statistics
-            if success:
-                stats["successful"] += 1
-            else:
-                stats["failed"] += 1
-                stats["failures"].append((pdf_path, "Conversion failed"))
-        except Exception as e:
-            error_message = str(e)
+            # Sync tools often touch PDFs without changing them, so compare
+            # contents with the hash recorded at conversion time
+            if output_name + SHA1_SUFFIX in out_mod_times:
+                try:
+                    with open(output_path + SHA1_SUFFIX, 'r', encoding='utf-8') as sha1_file:
+                        unchanged = sha1_file.read().strip() == _file_sha1(pdf_path)
+                except OSError:
+                    unchanged = False
+                if unchanged:
+                    # Refresh the output's mtime so the next run skips it cheaply
+                    os.utime(output_path)
+                    stats["skipped"] += 1
+                    continue
+        
+        jobs.append((pdf_path, output_path))
+    
+    # Convert the remaining files in parallel, one PDF per worker process
+    converter_options = {
+        "include_images": converter.include_images,
+        "image_dir": converter.image_dir,
+        "engine": converter.engine,
+        "page_timeout": converter.page_timeout,
+        "use_cache": converter.use_cache,
+    }
+    
+    failed_jobs = []
+    for pdf_path, output_path, success, error_message in _run_jobs(
+            jobs, converter_options, method_name, workers, f"Converting PDFs to {format_type}"):
+        # Update statistics
+        if success:
+            stats["successful"] += 1
+            continue
+        
+        stats["failed"] += 1
+        failed_jobs.append((pdf_path, output_path))
+        if error_message is None:
+            stats["failures"].append((pdf_path, "Conversion failed"))
+        else:
             print(f"Error converting {pdf_path}: {error_message}")
-            stats["failed"] += 1
             stats["failures"].append((pdf_path, error_message[:100] + "..." if len(error_message) > 100 else error_message))
     
+    # Retry failed files automatically with the fallback options, if any
+    retry_options = dict(converter_options)
+    if retry_engine:
+        retry_options["engine"] = retry_engine
+    if retry_without_images:
+        retry_options["include_images"] = False
+    
+    if failed_jobs and retry_options != converter_options:
+        print(f"\nRetrying {len(failed_jobs)} failed files with the {retry_options['engine']} engine"
+              f"{' without images' if retry_without_images else ''}...")
+        
+        recovered = set()
+        for pdf_path, _, success, _ in _run_jobs(
+                failed_jobs, retry_options, method_name, workers, "Retrying failed files"):
+            if success:
+                recovered.add(pdf_path)
+        
+        stats["successful"] += len(recovered)
+        stats["failed"] -= len(recovered)
+        stats["failures"] = [failure for failure in stats["failures"] if failure[0] not in recovered]
+        print(f"\nSuccessfully recovered {len(recovered)} of {len(failed_jobs)} failed files.")
+    
     # Generate a detailed report
     print("\nConversion complete!")
     print(f"Total files: {stats['total']}")
@@ -391,36 +909,38 @@ def batch_convert(converter, input_dir, output_dir, format_type, file_pattern="*
             print(f"  - {os.path.basename(file_path)}: {reason}")
         if len(stats["failures"]) > 10:
             print(f"  - ... and {len(stats['failures']) - 10} more failures")
-        
-        # Ask if user wants to retry failed conversions with alternative converter
-        if stats["failed"] > 0 and format_type == 'html' and converter.include_images:
-            print("\nSome files failed with the advanced converter.")
-            print("Would you like to try converting failed files with the alternative text-only converter? (y/n)")
-            retry_choice = input().strip().lower()
-            if retry_choice == 'y':
-                # Create alternative converter instance
-                alt_converter = PDFConverter(include_images=False)
-                
-                # Process only failed files
-                failed_files = [file_path for file_path, _ in stats["failures"]]
-                retry_successful = 0
-                
-                print(f"\nRetrying {len(failed_files)} failed files with alternative converter...")
-                for pdf_path in tqdm(failed_files, desc="Retrying with alt converter"):
-                    base_name = os.path.basename(pdf_path)
-                    file_name = os.path.splitext(base_name)[0]
-                    output_path = os.path.join(output_dir, f"{file_name}.html")
-                    
-                    try:
-                        if alt_converter.convert_to_html(pdf_path, output_path):
-                            retry_successful += 1
-                    except Exception as e:
-                        pass  # Already failed, just continue with others
-                
-                print(f"\nSuccessfully recovered {retry_successful} of {len(failed_files)} failed files.")
     
     return stats
 
+def _positive_int(value):
+    """Parse a command line value that must be a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def _positive_float(value):
+    """Parse a command line value that must be a number of seconds above 0."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {value!r}")
+    # The comparison also rejects nan
+    if not 0 < number < float('inf'):
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value}")
+    return number
+
+def _default_workers():
+    """Number of worker processes to use when --workers is not given."""
+    workers = os.cpu_count() or 1
+    # ProcessPoolExecutor refuses more than 61 workers on Windows
+    if sys.platform == 'win32':
+        workers = min(workers, 61)
+    return workers
+
 def main():
     # Set up command line argument parser
     parser = argparse.ArgumentParser(description="Advanced PDF Converter")
@@ -442,6 +962,20 @@ def main():
                         help="Extract and include images in the output (for HTML format)")
     parser.add_argument("--image_dir", default="extracted_images",
                         help="Directory to store extracted images (default: 'extracted_images')")
+    parser.add_argument("--engine", choices=['pypdfium2', 'pymupdf', 'pdfminer'], default=None,
+                        help="Text extraction engine (default: the first installed of pypdfium2, pymupdf, pdfminer)")
+    parser.add_argument("--page-timeout", type=_positive_float, default=None, metavar="SECONDS",
+                        help="Skip pages that take longer than this to process with the pdfminer engine")
+    parser.add_argument("--no-cache", action='store_true',
+                        help="Don't read or write the extracted text cache in ~/.cache/pdfconv")
+    parser.add_argument("--retry-with", choices=['none', 'pypdfium2', 'pymupdf', 'pdfminer'], default='none',
+                        help="Automatically retry failed files in batch mode with this engine (default: none)")
+    parser.add_argument("--retry-without-images", action='store_true',
+                        help="Automatically retry failed files in batch mode without image extraction")
+    parser.add_argument("--workers", type=_positive_int, default=None,
+                        help="Number of worker processes (default: number of CPUs). Batch mode converts "
+                             "one file per worker; single file mode splits the pages of PDFs over "
+                             f"{PAGE_SPLIT_THRESHOLD} pages (pypdfium2 and pymupdf engines only)")
     
     # Parse arguments
     args = parser.parse_args()
@@ -452,14 +986,38 @@ def main():
         print("Continuing without image extraction...")
         args.images = False
     
-    # Initialize converter
-    converter = PDFConverter(include_images=args.images, image_dir=args.image_dir)
+    if args.engine == 'pypdfium2' and not PDFIUM_AVAILABLE:
+        print("Warning: The pypdfium2 engine requires pypdfium2. Install with: pip install pypdfium2")
+        print("Continuing with the default engine...")
+        args.engine = None
+    elif args.engine == 'pymupdf' and not PYMUPDF_AVAILABLE:
+        print("Warning: The pymupdf engine requires PyMuPDF. Install with: pip install pymupdf")
+        print("Continuing with the default engine...")
+        args.engine = None
+    
+    if not args.no_cache:
+        prune_text_cache()
+    
+    retry_engine = None if args.retry_with == 'none' else args.retry_with
+    if ((retry_engine == 'pypdfium2' and not PDFIUM_AVAILABLE)
+            or (retry_engine == 'pymupdf' and not PYMUPDF_AVAILABLE)):
+        print(f"Warning: The {retry_engine} retry engine is not installed. Failed files will not be retried with it.")
+        retry_engine = None
+    
+    # Initialize converter. In single file mode the workers split the pages of
+    # large PDFs; in batch mode each worker converts a whole file instead.
+    converter = PDFConverter(include_images=args.images, image_dir=args.image_dir,
+                             engine=args.engine, page_timeout=args.page_timeout,
+                             use_cache=not args.no_cache,
+                             page_workers=(args.workers or _default_workers()) if args.input else 1)
     
     # Check if we're in batch mode or single file mode
     if args.input_dir and args.output_dir:
         # Batch mode
         print(f"Starting batch conversion from {args.input_dir} to {args.output_dir} in {args.format} format")
-        stats = batch_convert(converter, args.input_dir, args.output_dir, args.format)
+        stats = batch_convert(converter, args.input_dir, args.output_dir, args.format,
+                              workers=args.workers, retry_engine=retry_engine,
+                              retry_without_images=args.retry_without_images)
         
         # Print statistics
         print(f"\nConversion complete!")
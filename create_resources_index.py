@@ -5,11 +5,12 @@ the converted PDF files.
 """
 
 import os
-import glob
 import sys
-import re
 from datetime import datetime
 
+# Characters replaced with spaces when turning file names into display names
+DISPLAY_NAME_TABLE = str.maketrans({'_': ' ', '-': ' '})
+
 def create_index_html(resources_dir, output_file, title="PDF Resources", css_paths=None, js_paths=None):
     """
     Create an index.html file for the resources directory.
@@ -21,31 +22,37 @@ def create_index_html(resources_dir, output_file, title="PDF Resources", css_pat
         css_paths (list): List of CSS files to include
         js_paths (list): List of JavaScript files to include
     """
-    # Get all HTML files in the directory
-    html_files = glob.glob(os.path.join(resources_dir, "*.html"))
-    html_files = [f for f in html_files if os.path.basename(f) != "index.html"]
+    # Get all HTML files in the directory. DirEntry objects already carry the
+    # file name and cache their stat results. Hidden files are skipped, as
+    # glob("*.html") did.
+    html_entries = [
+        entry for entry in os.scandir(resources_dir)
+        if entry.name.endswith(".html") and not entry.name.startswith('.')
+        and entry.name != "index.html" and entry.is_file()
+    ]
     
     # Sort files alphabetically
-    html_files.sort(key=lambda x: os.path.basename(x).lower())
+    html_entries.sort(key=lambda entry: entry.name.lower())
     
-    # Start building the HTML content
-    html_content = f"""<!DOCTYPE html>
+    # Build the HTML content as a list of parts joined once at the end
+    parts = []
+    parts.append(f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title}</title>
-"""
+""")
     
     # Add CSS links
     if css_paths and isinstance(css_paths, list):
         for css_path in css_paths:
             if os.path.exists(css_path):
                 rel_path = os.path.relpath(css_path, os.path.dirname(output_file))
-                html_content += f'    <link rel="stylesheet" href="{rel_path}">\n'
+                parts.append(f'    <link rel="stylesheet" href="{rel_path}">\n')
     
     # Add additional CSS
-    html_content += """    <style>
+    parts.append("""    <style>
         body {
             font-family: Arial, sans-serif;
             line-height: 1.6;
@@ -131,40 +138,35 @@ def create_index_html(resources_dir, output_file, title="PDF Resources", css_pat
         <p>These PDF resources have been converted to HTML format for easier access and reference.</p>
         
         <div class="resources-container">
-"""
+""")
     
     # Add a card for each HTML file
-    for html_file in html_files:
-        filename = os.path.basename(html_file)
+    for entry in html_entries:
+        filename = entry.name
         name = os.path.splitext(filename)[0]
         
         # Format the name for display (replace underscores with spaces, etc.)
-        display_name = re.sub(r'[_\-]', ' ', name)
+        display_name = name.translate(DISPLAY_NAME_TABLE)
         
-        # Get file size in KB
+        # Get file size in KB and last modified date from the cached stat
         try:
-            size_kb = os.path.getsize(html_file) / 1024
-            size_str = f"{size_kb:.1f} KB"
-        except:
+            stat = entry.stat()
+            size_str = f"{stat.st_size / 1024:.1f} KB"
+            mod_date = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d')
+        except OSError:
             size_str = "Unknown size"
-        
-        # Get last modified date
-        try:
-            mod_time = os.path.getmtime(html_file)
-            mod_date = datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d')
-        except:
             mod_date = "Unknown date"
         
-        html_content += f"""            <div class="resource-card">
+        parts.append(f"""            <div class="resource-card">
                 <h3>{display_name}</h3>
                 <p>Size: {size_str}</p>
                 <p>Modified: {mod_date}</p>
                 <a href="{filename}">View Document</a>
             </div>
-"""
+""")
     
     # Close the main content
-    html_content += """        </div>
+    parts.append("""        </div>
         
         <p class="last-updated">Last updated: """ + datetime.now().strftime('%Y-%m-%d %H:%M:%S') + """</p>
     </main>
@@ -172,25 +174,25 @@ def create_index_html(resources_dir, output_file, title="PDF Resources", css_pat
     <footer>
         <p>&copy; FactoryXChange Skills Project</p>
     </footer>
-"""
+""")
     
     # Add JavaScript
     if js_paths and isinstance(js_paths, list):
         for js_path in js_paths:
             if os.path.exists(js_path):
                 rel_path = os.path.relpath(js_path, os.path.dirname(output_file))
-                html_content += f'    <script src="{rel_path}"></script>\n'
+                parts.append(f'    <script src="{rel_path}"></script>\n')
     
     # Close the HTML
-    html_content += """</body>
+    parts.append("""</body>
 </html>
-"""
+""")
     
     # Write the file
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.write("".join(parts))
     
-    print(f"Created index file at {output_file} with {len(html_files)} resources.")
+    print(f"Created index file at {output_file} with {len(html_entries)} resources.")
 
 def main():
     # Check arguments
@@ -25,7 +25,7 @@ set /p format_choice="Enter your choice (1-5): "
 
 if "%format_choice%"=="1" (
     echo Converting PDFs to HTML with images...
-    python advanced_pdf_converter.py --input_dir Resources --output_dir HTML_Resources --format html --images
+    python advanced_pdf_converter.py --input_dir Resources --output_dir HTML_Resources --format html --images --retry-without-images
 ) else if "%format_choice%"=="2" (
     echo Converting PDFs to HTML...
     python advanced_pdf_converter.py --input_dir Resources --output_dir HTML_Resources --format html
@@ -39,7 +39,7 @@ if "%format_choice%"=="1" (
     echo Converting PDFs to all formats...
     echo.
     echo HTML with images:
-    python advanced_pdf_converter.py --input_dir Resources --output_dir HTML_Resources --format html --images
+    python advanced_pdf_converter.py --input_dir Resources --output_dir HTML_Resources --format html --images --retry-without-images
     echo.
     echo Text:
     python advanced_pdf_converter.py --input_dir Resources --output_dir Text_Resources --format text
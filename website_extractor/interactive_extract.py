@@ -7,6 +7,9 @@ import webbrowser
 import os
 from pathlib import Path
 
+# Schemes a pasted URL may already start with
+URL_SCHEMES = ('http://', 'https://')
+
 def print_header():
     """Print the tool header."""
     print("\n" + "="*60)
@@ -53,7 +56,7 @@ def get_urls_input() -> List[str]:
             for url in line.split():
                 if url:  # Skip empty strings
                     # Add http:// if no protocol specified
-                    if not url.startswith(('http://', 'https://')):
+                    if not url.startswith(URL_SCHEMES):
                         url = 'https://' + url
                     urls.append(url)
                     
@@ -1,14 +1,157 @@
 import os
+import codecs
+import errno
+import hashlib
+import json
+import re
+import sqlite3
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 import shutil
+import threading
+import uuid
 from pathlib import Path
+import gc
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from queue import Queue
-import re
-from typing import Set, List, Optional
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import Counter, deque
+from typing import Dict, Set, List, Optional
+
+# Link prefixes _update_links leaves untouched, hrefs the crawler never
+# follows, and the schemes stripped from a bare domain
+_EXTERNAL_PREFIXES = ("http://", "https://", "mailto:", "tel:", "javascript:", "data:", "#")
+_SKIP_HREF_PREFIXES = ("#", "mailto:", "tel:", "javascript:", "data:")
+_URL_SCHEMES = ("http://", "https://")
+
+# Charset declared in a page's <meta> tags, looked for in the first bytes the
+# way browsers prescan a document served without a charset header
+META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+META_PRESCAN_BYTES = 1024
+
+# Every node extract_site rewrites, matched in a single pass over the page,
+# and the attribute and asset type each asset tag maps to
+PAGE_NODE_SELECTOR = "link[rel~=stylesheet][href], script[src], img[src], a[href]"
+ASSET_TAGS = {
+    "link": ("href", "css"),
+    "script": ("src", "js"),
+    "img": ("src", "images")
+}
+
+# Where each asset type is saved, relative to the project directory
+ASSET_SUBDIRS = {"css": "assets/css", "js": "assets/js", "images": "assets/images"}
+
+# Extension given to assets whose URL path has no filename
+_EXTS = {"css": ".css", "js": ".js", "images": ".png"}
+
+# Concurrent asset downloads per page, and pages extracted at once in
+# batch and crawl mode
+ASSET_WORKERS = 16
+BATCH_WORKERS = 4
+CRAWL_WORKERS = 8
+
+# Connections kept open per host, enough for every concurrent download
+CONNECTION_POOL_SIZE = 32
+
+# Transient failures are retried with a short backoff, honouring Retry-After
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False
+)
+
+# Assets are streamed to disk in chunks; oversized or stalled downloads are dropped
+ASSET_CHUNK_SIZE = 64 * 1024
+MAX_ASSET_BYTES = 50 * 1024 * 1024
+ASSET_TIMEOUT = 30
+
+# Per-project record of asset validators (ETag / Last-Modified)
+ASSETS_META_FILE = "assets_meta.json"
+
+# Content-addressed store under base_output_dir that pages hard-link assets from
+ASSET_POOL_DIR = "_assets_pool"
+
+# os.link errors meaning the file system can't hard-link the pool into a page,
+# where the asset is copied instead
+_NO_HARD_LINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EMLINK}
+
+# Pages a crawl extracts between garbage collections
+CRAWL_GC_INTERVAL = 50
+
+# Crawl frontier entries kept in memory before the rest spill to SQLite
+FRONTIER_MEMORY_LIMIT = 100_000
+
+# Politeness: requests in flight to one host at a time, and how long to wait
+# for its pages and robots.txt. Requests hold a host slot while they wait, so
+# every request needs a timeout or a hung server would block its host for good.
+MAX_REQUESTS_PER_HOST = 4
+PAGE_TIMEOUT = 30
+ROBOTS_TIMEOUT = 10
+
+@lru_cache(maxsize=8192)
+def _cached_urlparse(url):
+    """Parse a URL once; asset and link URLs repeat across a page and a crawl."""
+    return urlparse(url)
+
+def _url_key(url):
+    """Key a URL by its 64-bit hash; the crawl only needs membership, not the string."""
+    return hash(url)
+
+class _CrawlFrontier:
+    """
+    FIFO of (url, depth) pairs that spills to a temporary SQLite database.
+    
+    Up to memory_limit entries are held in a deque. Once it is full, new entries
+    go to disk until the deque has drained and been refilled from the database,
+    so entries always come out in the order they went in.
+    """
+    
+    def __init__(self, memory_limit=FRONTIER_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self._memory = deque()
+        self._db = None
+        self._spilled = 0
+    
+    def __len__(self):
+        return len(self._memory) + self._spilled
+    
+    def append(self, item):
+        """Add an entry at the back of the frontier."""
+        if self._spilled or len(self._memory) >= self.memory_limit:
+            if self._db is None:
+                # An empty filename is a private on-disk database deleted on close
+                self._db = sqlite3.connect("")
+                self._db.execute("CREATE TABLE frontier (id INTEGER PRIMARY KEY, url TEXT, depth INTEGER)")
+            self._db.execute("INSERT INTO frontier (url, depth) VALUES (?, ?)", item)
+            self._spilled += 1
+        else:
+            self._memory.append(item)
+    
+    def popleft(self):
+        """Remove and return the oldest entry, refilling memory from disk if needed."""
+        if not self._memory and self._spilled:
+            rows = self._db.execute(
+                "SELECT id, url, depth FROM frontier ORDER BY id LIMIT ?", (self.memory_limit,)
+            ).fetchall()
+            self._db.execute("DELETE FROM frontier WHERE id <= ?", (rows[-1][0],))
+            self._memory.extend((url, depth) for _, url, depth in rows)
+            self._spilled -= len(rows)
+        return self._memory.popleft()
+    
+    def close(self):
+        """Drop all entries and delete the spill database."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        self._memory.clear()
+        self._spilled = 0
 
 class WebsiteExtractor:
     """A tool for extracting website content and assets."""
@@ -26,8 +169,28 @@ class WebsiteExtractor:
         self.max_pages = max_pages
         self.max_depth = max_depth
         self.session = requests.Session()
-        self.visited_urls: Set[str] = set()
-        self.queue: Queue = Queue()
+        adapter = HTTPAdapter(
+            pool_connections=CONNECTION_POOL_SIZE,
+            pool_maxsize=CONNECTION_POOL_SIZE,
+            max_retries=RETRY_POLICY
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Hashes of every URL queued during a crawl (see _url_key)
+        self.visited_urls: Set[int] = set()
+        self.queue = _CrawlFrontier()
+        # Assets fetched during this run: absolute URL -> pool path and validators
+        # keyed by _url_key; values are (pool path, ETag, Last-Modified)
+        self._asset_cache: Dict[int, tuple] = {}
+        # Download locks exist only while a download of that URL is in progress:
+        # url key -> [lock, number of threads holding or waiting for it]
+        self._asset_locks: Dict[int, list] = {}
+        self._asset_locks_guard = threading.Lock()
+        # Per-host robots.txt rules and request slots, shared by all workers
+        self._robots: Dict[str, RobotFileParser] = {}
+        self._robots_lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_guard = threading.Lock()
         self.setup_logging()
     
     def setup_logging(self):
@@ -46,125 +209,408 @@ class WebsiteExtractor:
             url (str): The URL to extract content from
             project_name (str, optional): Name for the project folder. If None, derived from URL
         """
+        output_dir, _ = self._extract_page(url, project_name)
+        return output_dir
+    
+    def _extract_page(self, url, project_name=None, collect_links_for_domain=None):
+        """
+        Extract a page and collect its crawlable links from the same parse.
+        
+        Args:
+            url (str): The URL to extract content from
+            project_name (str, optional): Name for the project folder. If None, derived from URL
+            collect_links_for_domain (str, optional): Domain whose unvisited links are collected
+            
+        Returns:
+            tuple: Output directory and the list of new links found on the page
+        """
         if not project_name:
-            project_name = urlparse(url).netloc.replace(".", "_")
+            project_name = _cached_urlparse(url).netloc.replace(".", "_")
         
         # Create project directory
         project_dir = Path(self.base_output_dir) / project_name
         project_dir.mkdir(parents=True, exist_ok=True)
         
-        self.logger.info(f"Starting extraction of {url} to {project_dir}")
+        self.logger.info("Starting extraction of %s to %s", url, project_dir)
+        started = time.perf_counter()
         
         try:
             # Get the main page
-            response = self.session.get(url)
+            with self._host_slot(url):
+                response = self.session.get(url, timeout=PAGE_TIMEOUT)
             response.raise_for_status()
             
             # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            tree = self._parse(response)
             
-            # Extract and download assets
-            self._extract_assets(soup, url, project_dir)
+            # Find assets and links in one pass over the document
+            assets, anchors = self._select_nodes(tree)
             
-            # Update links in HTML to point to local assets
-            self._update_links(soup, url)
+            # Collect links to crawl before they are rewritten
+            new_links = []
+            if collect_links_for_domain:
+                new_links = self._find_new_links(anchors, url, collect_links_for_domain)
             
-            # Save the modified HTML
-            index_path = project_dir / "index.html"
-            with open(index_path, "w", encoding="utf-8") as f:
-                f.write(str(soup.prettify()))
+            # The page is rewritten and saved while its assets download
+            with ThreadPoolExecutor(max_workers=ASSET_WORKERS) as executor:
+                # Extract and download assets
+                meta, downloads = self._extract_assets(assets, url, project_dir, executor)
+                
+                # Update links in HTML to point to local assets
+                self._update_links(anchors, url)
+                
+                # Save the modified HTML
+                self._declare_utf8(tree)
+                index_path = project_dir / "index.html"
+                with open(index_path, "wb") as f:
+                    f.write(tree.html.encode("utf-8"))
+                
+                # Free the parsed document while the asset downloads finish
+                del tree, assets, anchors, response
+            self._save_assets_meta(project_dir, meta)
             
-            self.logger.info(f"Successfully extracted site to {project_dir}")
-            return str(project_dir)
+            fetched = [future.result() for future in downloads]
+            self.logger.info(
+                "Successfully extracted site to %s (%d assets, %d failed, %d bytes downloaded, %.0f ms)",
+                project_dir, len(fetched), fetched.count(None),
+                sum(size for size in fetched if size), (time.perf_counter() - started) * 1000
+            )
+            return str(project_dir), new_links
             
         except Exception as e:
-            self.logger.error(f"Error extracting site: {str(e)}")
+            self.logger.error("Error extracting site: %s", e)
             raise
     
-    def _extract_assets(self, soup, base_url, project_dir):
-        """Extract and save all assets from the page."""
+    def _parse(self, response):
+        """
+        Parse an HTML response with the Lexbor parser.
+        
+        The charset comes from the Content-Type header, then from a <meta> tag
+        near the top of the page, and defaults to UTF-8. UTF-8 bytes are handed
+        to the parser, which decodes them in C; other charsets are decoded first.
+        """
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "charset" in content_type:
+            encoding = response.encoding
+        else:
+            match = META_CHARSET_PATTERN.search(response.content[:META_PRESCAN_BYTES])
+            encoding = match.group(1).decode("ascii") if match else "utf-8"
+        
+        try:
+            encoding = codecs.lookup(encoding).name
+        except (LookupError, TypeError):
+            encoding = "utf-8"
+        
+        if encoding == "utf-8":
+            return LexborHTMLParser(response.content)
+        return LexborHTMLParser(response.content.decode(encoding, errors="replace"))
+    
+    def _declare_utf8(self, tree):
+        """Point the page's charset declarations at UTF-8, the encoding it is saved in."""
+        declared = False
+        for meta in tree.css("meta[charset], meta[http-equiv]"):
+            if "charset" in meta.attrs:
+                meta.attrs["charset"] = "utf-8"
+                declared = True
+            elif (meta.attrs.get("http-equiv") or "").lower() == "content-type":
+                meta.attrs["content"] = "text/html; charset=utf-8"
+                declared = True
+        
+        # Pages that declared nothing get a declaration at the top of <head>
+        if not declared and tree.head is not None:
+            meta = LexborHTMLParser('<meta charset="utf-8">').css_first("meta")
+            if tree.head.child is not None:
+                tree.head.child.insert_before(meta)
+            else:
+                tree.head.insert_child(meta)
+    
+    def _select_nodes(self, tree):
+        """
+        Split the page's rewritable nodes into asset references and anchors.
+        
+        Returns:
+            tuple: (node, attribute, asset type) for each asset, and the list of anchors
+        """
+        assets = []
+        anchors = []
+        for node in tree.css(PAGE_NODE_SELECTOR):
+            if node.tag == "a":
+                anchors.append(node)
+                continue
+            
+            # Valueless attributes (<img src>) come back as None and are skipped
+            attr, asset_type = ASSET_TAGS.get(node.tag, (None, None))
+            if attr and node.attrs.get(attr):
+                assets.append((node, attr, asset_type))
+        
+        return assets, anchors
+    
+    def _extract_assets(self, assets, base_url, project_dir, executor):
+        """
+        Queue the page's asset downloads and point the page at the local copies.
+        
+        The downloads run on executor; the returned metadata is complete once
+        the executor has been shut down.
+        
+        Returns:
+            tuple: Asset validators to save with _save_assets_meta, and the
+            download futures, each resolving to the bytes fetched or None
+        """
         # Create asset directories
-        assets_dir = project_dir / "assets"
-        css_dir = assets_dir / "css"
-        js_dir = assets_dir / "js"
-        img_dir = assets_dir / "images"
+        asset_dirs = {asset_type: project_dir / subdir for asset_type, subdir in ASSET_SUBDIRS.items()}
         
-        for directory in [css_dir, js_dir, img_dir]:
+        for directory in asset_dirs.values():
             directory.mkdir(parents=True, exist_ok=True)
         
-        # Extract and save CSS files
-        for css in soup.find_all("link", rel="stylesheet"):
-            if css.get("href"):
-                self._download_asset(css["href"], base_url, css_dir, "css")
-                css["href"] = self._get_relative_path(css_dir, project_dir, css["href"])
-        
-        # Extract and save JavaScript files
-        for script in soup.find_all("script", src=True):
-            if script.get("src"):
-                self._download_asset(script["src"], base_url, js_dir, "js")
-                script["src"] = self._get_relative_path(js_dir, project_dir, script["src"])
-        
-        # Extract and save images
-        for img in soup.find_all("img"):
-            if img.get("src"):
-                self._download_asset(img["src"], base_url, img_dir, "images")
-                img["src"] = self._get_relative_path(img_dir, project_dir, img["src"])
+        # Every asset reference on the page: (node, attribute, directory, type)
+        targets = [(node, attr, asset_dirs[asset_type], asset_type) for node, attr, asset_type in assets]
+        
+        # Download the assets concurrently. References that map to the same
+        # local file are only downloaded once, by the first URL seen.
+        downloads = {}
+        relative_paths = []
+        for node, attr, asset_dir, asset_type in targets:
+            relative_path = self._get_relative_path(asset_type, node.attrs[attr])
+            relative_paths.append(relative_path)
+            downloads.setdefault(relative_path, (node.attrs[attr], asset_dir, asset_type))
+        
+        meta = self._load_assets_meta(project_dir)
+        futures = [
+            executor.submit(self._download_asset, url, base_url, asset_dir, asset_type, meta)
+            for url, asset_dir, asset_type in downloads.values()
+        ]
+        
+        # Point the page at the local copies
+        for (node, attr, _, _), relative_path in zip(targets, relative_paths):
+            node.attrs[attr] = relative_path
+        
+        return meta, futures
+    
+    def _load_assets_meta(self, project_dir):
+        """Load the asset validators saved by a previous extraction."""
+        try:
+            with open(project_dir / ASSETS_META_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
     
-    def _download_asset(self, url, base_url, save_dir, asset_type):
-        """Download an asset file."""
+    def _save_assets_meta(self, project_dir, meta):
+        """Save the asset validators for the next extraction."""
+        try:
+            with open(project_dir / ASSETS_META_FILE, "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+        except OSError as e:
+            self.logger.warning("Failed to save asset metadata: %s", e)
+    
+    def _download_asset(self, url, base_url, save_dir, asset_type, meta=None):
+        """
+        Download an asset file.
+        
+        Bodies are stored once in the shared asset pool and hard-linked into
+        save_dir, so an asset used by many pages of a crawl is fetched once.
+        When meta holds validators for the URL from an earlier run, the request
+        is conditional and a 304 reply keeps the local copy without a body.
+        Each call only writes its own URL's entry, so the dict can be shared
+        between download threads.
+        
+        Returns:
+            int: Bytes fetched (0 when the local copy was reused), or None on failure
+        """
         try:
             absolute_url = urljoin(base_url, url)
-            filename = os.path.basename(urlparse(url).path)
-            if not filename:
-                filename = "index" + self._get_extension(asset_type)
-            
+            filename = self._asset_filename(url, asset_type)
             save_path = save_dir / filename
             
-            # Skip if already downloaded
-            if save_path.exists():
-                return filename
-            
-            response = self.session.get(absolute_url)
-            response.raise_for_status()
-            
-            with open(save_path, "wb") as f:
-                f.write(response.content)
+            # Pages extracted at the same time wait for each other's download
+            with self._asset_lock(absolute_url):
+                # Already fetched during this run: link the pooled copy
+                pooled = self._asset_cache.get(_url_key(absolute_url))
+                if pooled and pooled[0].exists():
+                    pool_path, etag, last_modified = pooled
+                    self._link_asset(pool_path, save_path)
+                    if meta is not None:
+                        meta[absolute_url] = {
+                            "etag": etag,
+                            "last_modified": last_modified,
+                            "filename": filename
+                        }
+                    return 0
+                
+                cached = (meta or {}).get(absolute_url)
+                if cached and cached.get("filename") != filename:
+                    cached = None
+                
+                headers = {}
+                if cached and save_path.exists():
+                    if cached.get("etag"):
+                        headers["If-None-Match"] = cached["etag"]
+                    if cached.get("last_modified"):
+                        headers["If-Modified-Since"] = cached["last_modified"]
+                
+                # Skip if already downloaded and there is nothing to revalidate with
+                if save_path.exists() and not headers:
+                    return 0
+                
+                with self._host_slot(absolute_url), \
+                        self.session.get(absolute_url, headers=headers, stream=True, timeout=ASSET_TIMEOUT) as response:
+                    if response.status_code == 304:
+                        # Later pages of this run link the revalidated copy
+                        self._asset_cache[_url_key(absolute_url)] = (
+                            save_path, cached.get("etag"), cached.get("last_modified"))
+                        return 0
+                    response.raise_for_status()
+                    
+                    content_length = response.headers.get("Content-Length")
+                    if content_length and content_length.isdigit() and int(content_length) > MAX_ASSET_BYTES:
+                        raise ValueError(f"asset is larger than {MAX_ASSET_BYTES} bytes")
+                    
+                    pool_path = self._store_in_pool(response, filename)
+                
+                self._link_asset(pool_path, save_path)
+                
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                self._asset_cache[_url_key(absolute_url)] = (pool_path, etag, last_modified)
+                if meta is not None:
+                    meta[absolute_url] = {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "filename": filename
+                    }
             
-            self.logger.info(f"Downloaded {asset_type} asset: {filename}")
-            return filename
+            size = pool_path.stat().st_size
+            self.logger.debug("Downloaded %s asset: %s (%d bytes)", asset_type, filename, size)
+            return size
             
         except Exception as e:
-            self.logger.warning(f"Failed to download asset {url}: {str(e)}")
+            self.logger.warning("Failed to download asset %s: %s", url, e)
             return None
     
-    def _get_extension(self, asset_type):
-        """Get default extension for asset type."""
-        extensions = {
-            "css": ".css",
-            "js": ".js",
-            "images": ".png"
-        }
-        return extensions.get(asset_type, "")
+    def _host_slot(self, url):
+        """Get the semaphore that caps concurrent requests to the URL's host."""
+        host = _cached_urlparse(url).netloc
+        with self._host_slots_guard:
+            return self._host_slots.setdefault(host, threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST))
+    
+    def _can_fetch(self, url):
+        """Check the host's robots.txt, fetching it the first time the host is seen."""
+        parsed = _cached_urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._robots_lock:
+            robots = self._robots.get(origin)
+            if robots is None:
+                robots = self._load_robots(origin)
+                self._robots[origin] = robots
+        return robots.can_fetch("*", url)
+    
+    def _load_robots(self, origin):
+        """Fetch and parse robots.txt; a missing or unreachable file allows everything."""
+        robots = RobotFileParser(origin + "/robots.txt")
+        try:
+            with self._host_slot(origin):
+                response = self.session.get(origin + "/robots.txt", timeout=ROBOTS_TIMEOUT)
+            if response.status_code in (401, 403):
+                robots.disallow_all = True
+            elif response.status_code >= 400:
+                robots.allow_all = True
+            else:
+                robots.parse(response.text.splitlines())
+        except Exception as e:
+            self.logger.warning("Failed to read %s/robots.txt: %s", origin, e)
+            robots.allow_all = True
+        return robots
+    
+    @contextmanager
+    def _asset_lock(self, absolute_url):
+        """Hold the lock that serialises downloads of one asset URL, then drop it."""
+        key = _url_key(absolute_url)
+        with self._asset_locks_guard:
+            entry = self._asset_locks.get(key)
+            if entry is None:
+                entry = self._asset_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._asset_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._asset_locks[key]
+    
+    def _store_in_pool(self, response, filename):
+        """Stream a response into the asset pool and return its content-addressed path."""
+        pool_dir = Path(self.base_output_dir) / ASSET_POOL_DIR
+        pool_dir.mkdir(parents=True, exist_ok=True)
+        
+        temp_path = pool_dir / f"{uuid.uuid4().hex}.part"
+        digest = self._stream_to_file(response, temp_path)
+        
+        pool_path = pool_dir / (digest + Path(filename).suffix)
+        os.replace(temp_path, pool_path)
+        return pool_path
+    
+    def _link_asset(self, pool_path, save_path):
+        """Hard-link a pooled asset into a page, copying where links are unsupported."""
+        # Link under a temporary name and move it into place, so an existing
+        # file (possibly a link to another pooled body) is never written through
+        temp_path = save_path.with_name(f".{save_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            try:
+                os.link(pool_path, temp_path)
+            except OSError as e:
+                if e.errno not in _NO_HARD_LINK_ERRNOS:
+                    raise
+                shutil.copyfile(pool_path, temp_path)
+            os.replace(temp_path, save_path)
+        except BaseException:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
     
-    def _get_relative_path(self, asset_dir, project_dir, original_path):
+    def _stream_to_file(self, response, save_path):
+        """
+        Write a streamed response body to disk, removing partial files on failure.
+        
+        Returns:
+            str: SHA-256 hex digest of the body
+        """
+        written = 0
+        digest = hashlib.sha256()
+        try:
+            with open(save_path, "wb") as f:
+                for chunk in response.iter_content(ASSET_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > MAX_ASSET_BYTES:
+                        raise ValueError(f"asset is larger than {MAX_ASSET_BYTES} bytes")
+                    digest.update(chunk)
+                    f.write(chunk)
+        except Exception:
+            save_path.unlink()
+            raise
+        return digest.hexdigest()
+    
+    def _asset_filename(self, url, asset_type):
+        """Get the local filename for an asset URL."""
+        filename = os.path.basename(_cached_urlparse(url).path)
+        return filename or "index" + _EXTS.get(asset_type, "")
+    
+    def _get_relative_path(self, asset_type, original_path):
         """Convert asset path to relative path from project root."""
         try:
-            filename = os.path.basename(urlparse(original_path).path)
-            if not filename:
-                filename = "index" + self._get_extension(asset_dir.name)
-            
-            relative_path = os.path.relpath(asset_dir / filename, project_dir)
-            return relative_path.replace("\\", "/")
+            # The asset layout is fixed, so the path is a plain concatenation
+            return ASSET_SUBDIRS[asset_type] + "/" + self._asset_filename(original_path, asset_type)
             
         except Exception:
             return original_path
     
-    def _update_links(self, soup, base_url):
+    def _update_links(self, anchors, base_url):
         """Update all links in the HTML to work with local files."""
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if not href.startswith(("http://", "https://", "mailto:", "#")):
-                a["href"] = urljoin(base_url, href)
+        for a in anchors:
+            # A valueless <a href> is None; treat it as empty like an HTML parser would
+            href = a.attrs.get("href") or ""
+            if not href.startswith(_EXTERNAL_PREFIXES):
+                a.attrs["href"] = urljoin(base_url, href)
 
     def extract_site_batch(self, urls: List[str], project_name: Optional[str] = None) -> List[str]:
         """
@@ -177,19 +623,39 @@ class WebsiteExtractor:
         Returns:
             List[str]: List of output directories
         """
-        output_dirs = []
+        # Results are stored by position so the output keeps the input order
+        results: List[Optional[str]] = [None] * len(urls)
+        completed = 0
         
-        for i, url in enumerate(urls):
-            try:
+        # Pages are extracted concurrently and must not write into the same
+        # directory, so URLs whose default folder is shared get numbered ones
+        default_projects = [_cached_urlparse(url).netloc.replace(".", "_") for url in urls]
+        project_counts = Counter(default_projects)
+        project_numbers = Counter()
+        
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+            futures = {}
+            for i, url in enumerate(urls):
                 # Create unique project name for each URL if not specified
-                current_project = f"{project_name}_{i+1}" if project_name else None
-                output_dir = self.extract_site(url, current_project)
-                output_dirs.append(output_dir)
-                self.logger.info(f"Completed {i+1}/{len(urls)}: {url}")
-            except Exception as e:
-                self.logger.error(f"Failed to extract {url}: {str(e)}")
+                if project_name:
+                    current_project = f"{project_name}_{i+1}"
+                elif project_counts[default_projects[i]] > 1:
+                    project_numbers[default_projects[i]] += 1
+                    current_project = f"{default_projects[i]}_{project_numbers[default_projects[i]]}"
+                else:
+                    current_project = None
+                futures[executor.submit(self.extract_site, url, current_project)] = i
+            
+            for future in as_completed(futures):
+                i = futures[future]
+                completed += 1
+                try:
+                    results[i] = future.result()
+                    self.logger.info("Completed %d/%d: %s", completed, len(urls), urls[i])
+                except Exception as e:
+                    self.logger.error("Failed to extract %s: %s", urls[i], e)
         
-        return output_dirs
+        return [output_dir for output_dir in results if output_dir is not None]
 
     def crawl_domain(self, start_url: str, project_name: Optional[str] = None) -> List[str]:
         """
@@ -202,62 +668,89 @@ class WebsiteExtractor:
         Returns:
             List[str]: List of output directories
         """
-        base_domain = urlparse(start_url).netloc
+        base_domain = _cached_urlparse(start_url).netloc
+        # Every page gets its own numbered folder; pages are extracted
+        # concurrently and must not write into the same directory
+        if not project_name:
+            project_name = base_domain.replace(".", "_")
+        
         self.visited_urls.clear()
-        self.queue = Queue()
-        self.queue.put((start_url, 0))  # (url, depth)
+        self.queue.close()
+        self.queue = _CrawlFrontier()
+        self.queue.append((start_url, 0))  # (url, depth)
+        self.visited_urls.add(_url_key(start_url))
         output_dirs = []
         pages_extracted = 0
-
-        while not self.queue.empty():
-            current_url, depth = self.queue.get()
-            
-            # Check if we've hit the limits
-            if self.max_pages and pages_extracted >= self.max_pages:
-                break
-            if self.max_depth and depth > self.max_depth:
-                continue
-            
-            # Skip if already visited
-            if current_url in self.visited_urls:
-                continue
-            
-            try:
-                # Extract the current page
-                current_project = f"{project_name}_{pages_extracted+1}" if project_name else None
-                output_dir = self.extract_site(current_url, current_project)
-                output_dirs.append(output_dir)
-                self.visited_urls.add(current_url)
-                pages_extracted += 1
+        pages_started = 0
+        pending = {}  # future -> (url, depth)
+        
+        # Only this thread touches the queue; workers return the links they find.
+        # URLs are marked visited when queued, so the queue never holds duplicates.
+        with ThreadPoolExecutor(max_workers=CRAWL_WORKERS) as executor:
+            while self.queue or pending:
+                # Hand pages from the queue to idle workers
+                while self.queue and len(pending) < CRAWL_WORKERS:
+                    # Check if we've hit the limits
+                    if self.max_pages and pages_extracted + len(pending) >= self.max_pages:
+                        break
+                    
+                    current_url, depth = self.queue.popleft()
+                    if not self._can_fetch(current_url):
+                        self.logger.info("Skipping %s: disallowed by robots.txt", current_url)
+                        continue
+                    
+                    pages_started += 1
+                    current_project = f"{project_name}_{pages_started}"
+                    future = executor.submit(self._extract_page, current_url, current_project, base_domain)
+                    pending[future] = (current_url, depth)
                 
-                # Find and queue new links
-                self._queue_new_links(current_url, base_domain, depth + 1)
+                if not pending:
+                    break
                 
-            except Exception as e:
-                self.logger.error(f"Failed to extract {current_url}: {str(e)}")
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    current_url, depth = pending.pop(future)
+                    try:
+                        output_dir, new_links = future.result()
+                    except Exception as e:
+                        self.logger.error("Failed to extract %s: %s", current_url, e)
+                        continue
+                    
+                    output_dirs.append(output_dir)
+                    pages_extracted += 1
+                    
+                    # Long crawls parse thousands of pages; collect what they leave behind
+                    if pages_extracted % CRAWL_GC_INTERVAL == 0:
+                        gc.collect()
+                    
+                    # Queue new links
+                    if self.max_depth and depth + 1 > self.max_depth:
+                        continue
+                    for link in new_links:
+                        key = _url_key(link)
+                        if key not in self.visited_urls:
+                            self.visited_urls.add(key)
+                            self.queue.append((link, depth + 1))
         
+        self.queue.close()
         return output_dirs
 
-    def _queue_new_links(self, url: str, base_domain: str, depth: int):
-        """Queue new links found on the page for crawling."""
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+    def _find_new_links(self, anchors, url: str, base_domain: str) -> List[str]:
+        """Find links among a page's anchors that can be crawled next."""
+        new_links = []
+        for a in anchors:
+            href = a.attrs.get('href') or ""
+            if href.startswith(_SKIP_HREF_PREFIXES):
+                continue
             
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                absolute_url = urljoin(url, href)
-                parsed = urlparse(absolute_url)
-                
-                # Only queue links from the same domain that we haven't visited
-                if (parsed.netloc == base_domain and 
-                    absolute_url not in self.visited_urls and
-                    not href.startswith(('#', 'mailto:', 'tel:'))):
-                    self.queue.put((absolute_url, depth))
-                    
-        except Exception as e:
-            self.logger.warning(f"Failed to queue links from {url}: {str(e)}")
+            absolute_url = urljoin(url, href)
+            parsed = _cached_urlparse(absolute_url)
+            
+            # Only queue links from the same domain that we haven't visited
+            if parsed.netloc == base_domain and _url_key(absolute_url) not in self.visited_urls:
+                new_links.append(absolute_url)
+        
+        return new_links
 
     def extract_subdomains(self, domain: str, project_name: Optional[str] = None) -> List[str]:
         """
@@ -271,23 +764,39 @@ class WebsiteExtractor:
             List[str]: List of output directories
         """
         # Remove protocol if present
-        clean_domain = re.sub(r'^https?://', '', domain)
+        clean_domain = domain
+        if clean_domain.startswith(_URL_SCHEMES):
+            clean_domain = clean_domain.split("://", 1)[1]
         
         # Try common subdomains
         common_subdomains = ['www', 'blog', 'docs', 'api', 'support', 'help']
         urls_to_try = [f"https://{sub}.{clean_domain}" for sub in common_subdomains]
         urls_to_try.append(f"https://{clean_domain}")
         
-        # Filter out unreachable subdomains
-        valid_urls = []
-        for url in urls_to_try:
-            try:
-                response = self.session.head(url, timeout=5)
-                if response.status_code == 200:
-                    valid_urls.append(url)
-                    self.logger.info(f"Found valid subdomain: {url}")
-            except Exception:
-                continue
+        # Filter out unreachable subdomains, probing them all at once. Probes
+        # get their own session without retries: a missing subdomain should
+        # fail on the first attempt rather than after RETRY_POLICY's backoff.
+        reachable = set()
+        with requests.Session() as probe_session, \
+                ThreadPoolExecutor(max_workers=len(urls_to_try)) as executor:
+            probe_adapter = HTTPAdapter(pool_maxsize=len(urls_to_try), max_retries=0)
+            probe_session.mount("http://", probe_adapter)
+            probe_session.mount("https://", probe_adapter)
+            futures = {
+                executor.submit(probe_session.head, url, timeout=5, allow_redirects=True): url
+                for url in urls_to_try
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    if future.result().status_code < 400:
+                        reachable.add(url)
+                        self.logger.info("Found valid subdomain: %s", url)
+                except Exception:
+                    continue
+        
+        # Keep the order the subdomains were listed in
+        valid_urls = [url for url in urls_to_try if url in reachable]
         
         # Extract content from valid URLs
         return self.extract_site_batch(valid_urls, project_name)